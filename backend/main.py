@@ -1,12 +1,20 @@
 import queue
+import asyncio
 from fastapi import FastAPI, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
 from pydantic import BaseModel
 from typing import List, Optional
+from dataclasses import asdict, dataclass
 import math
-from collections import deque
+import numpy as np
+from numba import njit
 
-app = FastAPI(title="Ride Dispatch System", version="1.0.0")
+app = FastAPI(
+    title="Ride Dispatch System",
+    version="1.0.0",
+    default_response_class=ORJSONResponse,
+)
 
 # Enable CORS for frontend
 app.add_middleware(
@@ -17,30 +25,35 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# Pydantic models
-class Location(BaseModel):
+# Internal state models; inputs are validated by the request models below
+@dataclass(slots=True)
+class Location:
     x: int
     y: int
 
-class Driver(BaseModel):
+@dataclass(slots=True)
+class Driver:
     id: str
     location: Location
     status: str = "available"  # available, on_trip, offline
 
-class Rider(BaseModel):
+@dataclass(slots=True)
+class Rider:
     id: str
     pickup_location: Location
     dropoff_location: Location
 
-class RideRequest(BaseModel):
+@dataclass(slots=True)
+class RideRequest:
     rider_id: str
     pickup_location: Location
     dropoff_location: Location
     status: str = "waiting"  # waiting, assigned, rejected, completed, failed
-    drivers_rejected: set
+    drivers_rejected: int = 0  # bitmask over driver_idx positions
     assigned_driver: Optional[str] = None
     current_phase: str = "to_pickup"  # to_pickup, to_dropoff, completed
 
+# Pydantic request models
 class AddDriverRequest(BaseModel):
     id: str
     x: int
@@ -66,117 +79,310 @@ class AddRideRequest(BaseModel):
 
 # In-memory storage
 drivers = {}
-driver_locations = {}
+driver_locations = {}  # x * PADDED_GRID_SIZE + y -> set of driver ids in that cell
+driver_idx = {}  # driver id -> stable bit position in rejection masks, never reused
+driver_id_by_idx = []
+available_driver_locations = {}  # same mapping, restricted to available drivers
 riders = {}
 ride_requests = {}
+assigned_rides = {}  # rider id -> ride request, for rides a driver has accepted
 current_tick = 0
 
-def find_next_available_driver(pickup_location, drivers_rejected):
-    """Find the next closest available driver that hasn't been rejected"""
-    queue = deque()
-    queue.append((pickup_location.x, pickup_location.y, 0))
-    dirs = [(1,0), (-1,0), (0,1), (0,-1)]
-    locations_visited = set()
-    locations_visited.add((pickup_location.x, pickup_location.y))
-    
-    while queue:
-        x, y, distance = queue.popleft()
-        
-        if (x, y) in driver_locations:
-            for driver_id in driver_locations[(x, y)]:
-                if (drivers[driver_id].status == "available" and 
-                    driver_id not in drivers_rejected):
-                    return driver_id, distance
-        
+# Serialized snapshots for /state, refreshed whenever the underlying object changes
+driver_json = {}
+rider_json = {}
+ride_json = {}
+
+# Serializes mutations of the in-memory state across concurrent requests
+state_lock = asyncio.Lock()
+
+# Driver positions and availability mirrored into dense arrays for vectorized search
+driver_row = {}  # driver id -> row in the arrays below
+driver_ids = np.empty(0, dtype=object)
+driver_coords = np.empty((0, 2), dtype=np.int16)
+driver_available = np.empty(0, dtype=bool)
+
+# Cell grids are padded from 100x100 to 128x128: one mask checks both bounds at once, and
+# a cell's flat index x * PADDED_GRID_SIZE + y keys the per-cell dicts.
+# The padding cells are pre-marked as visited for the BFS
+PADDED_GRID_SIZE = 128
+OUT_OF_GRID_MASK = ~(PADDED_GRID_SIZE - 1)
+PADDING_CELLS = np.ones((PADDED_GRID_SIZE, PADDED_GRID_SIZE), dtype=np.bool_)
+PADDING_CELLS[:100, :100] = False
+
+# 4-neighbourhood offsets for the grid BFS, built once instead of per search
+BFS_DIRECTIONS = np.array([[1, 0], [-1, 0], [0, 1], [0, -1]], dtype=np.int8)
+
+# Number of available drivers in each grid cell, kept in step with the arrays above
+cell_available = np.zeros((PADDED_GRID_SIZE, PADDED_GRID_SIZE), dtype=np.int16)
+available_driver_count = 0
+
+# Scratch grid counting rejected-but-available drivers per cell during a single search
+cell_rejected = np.zeros((PADDED_GRID_SIZE, PADDED_GRID_SIZE), dtype=np.int16)
+
+# BFS scratch buffers, allocated once; the BFS clears the cells it marks before returning
+bfs_visited = PADDING_CELLS.copy()
+bfs_queue_x = np.empty(100 * 100, dtype=np.int16)
+bfs_queue_y = np.empty(100 * 100, dtype=np.int16)
+bfs_queue_distance = np.empty(100 * 100, dtype=np.int16)
+
+# Above this many available drivers, nearest-driver search walks the cell grid instead of scanning drivers
+GRID_SEARCH_MIN_DRIVERS = 32
+UNREACHABLE_DISTANCE = np.iinfo(np.int16).max
+
+def rejected_driver_ids(drivers_rejected):
+    """Yield the driver ids whose bits are set in a rejection mask"""
+    while drivers_rejected:
+        lowest_bit = drivers_rejected & -drivers_rejected
+        yield driver_id_by_idx[lowest_bit.bit_length() - 1]
+        drivers_rejected ^= lowest_bit
+
+def cache_driver_json(driver_id):
+    """Refresh the serialized snapshot of a driver"""
+    driver_json[driver_id] = asdict(drivers[driver_id])
+
+def cache_rider_json(rider_id):
+    """Refresh the serialized snapshot of a rider"""
+    rider_json[rider_id] = asdict(riders[rider_id])
+
+def cache_ride_json(rider_id):
+    """Refresh the serialized snapshot of a ride request"""
+    snapshot = asdict(ride_requests[rider_id])
+    snapshot["drivers_rejected"] = list(rejected_driver_ids(snapshot["drivers_rejected"]))
+    ride_json[rider_id] = snapshot
+
+def release_available_cell(driver_id, row):
+    """Drop an available driver from the per-cell availability indexes"""
+    global available_driver_count
+    x, y = driver_coords[row].tolist()
+    cell_available[x, y] -= 1
+    available_driver_count -= 1
+    cell = x * PADDED_GRID_SIZE + y
+    available_driver_locations[cell].remove(driver_id)
+    if not available_driver_locations[cell]:
+        del available_driver_locations[cell]
+
+def sync_driver_row(driver_id):
+    """Mirror a driver's position and availability into the dense arrays and cell indexes"""
+    global driver_ids, driver_coords, driver_available, available_driver_count
+    driver = drivers[driver_id]
+    row = driver_row.get(driver_id)
+    if row is None:
+        row = len(driver_row)
+        if row == len(driver_ids):
+            # Grow geometrically so appends stay amortized O(1)
+            extra = max(16, row)
+            driver_ids = np.concatenate([driver_ids, np.empty(extra, dtype=object)])
+            driver_coords = np.concatenate([driver_coords, np.zeros((extra, 2), dtype=np.int16)])
+            driver_available = np.concatenate([driver_available, np.zeros(extra, dtype=bool)])
+        driver_row[driver_id] = row
+        driver_ids[row] = driver_id
+    elif driver_available[row]:
+        release_available_cell(driver_id, row)
+
+    x, y = driver.location.x, driver.location.y
+    driver_coords[row] = (x, y)
+    driver_available[row] = driver.status == "available"
+    if driver_available[row]:
+        cell_available[x, y] += 1
+        available_driver_count += 1
+        cell = x * PADDED_GRID_SIZE + y
+        if cell not in available_driver_locations:
+            available_driver_locations[cell] = set()
+        available_driver_locations[cell].add(driver_id)
+
+def remove_driver_row(driver_id):
+    """Drop a driver from the dense arrays, moving the last row into its slot"""
+    row = driver_row.pop(driver_id)
+    last = len(driver_row)
+    if driver_available[row]:
+        release_available_cell(driver_id, row)
+    if row != last:
+        moved_id = driver_ids[last]
+        driver_ids[row] = moved_id
+        driver_coords[row] = driver_coords[last]
+        driver_available[row] = driver_available[last]
+        driver_row[moved_id] = row
+    driver_ids[last] = None
+    driver_available[last] = False
+
+# Explicit signature compiles at import, not on the first dispatch inside a locked handler
+@njit(
+    "UniTuple(int64, 3)(int16[:, ::1], int64, int64, int16[:, ::1],"
+    " boolean[:, ::1], int16[::1], int16[::1], int16[::1])",
+    cache=True,
+)
+def bfs_nearest(avail_grid, px, py, rejected_mask, visited, queue_x, queue_y, queue_distance):
+    """BFS from (px, py) for the closest cell with a non-rejected available driver.
+
+    Returns (cell_x, cell_y, distance), or (-1, -1, -1) if no cell qualifies.
+    visited must only have the padding cells set; every cell marked here is cleared again.
+    """
+    queue_x[0], queue_y[0], queue_distance[0] = px, py, 0
+    visited[px, py] = True
+    head, tail = 0, 1
+    found_x, found_y, found_distance = -1, -1, -1
+
+    while head < tail:
+        x, y, distance = queue_x[head], queue_y[head], queue_distance[head]
+        head += 1
+        if avail_grid[x, y] > rejected_mask[x, y]:
+            found_x, found_y, found_distance = x, y, distance
+            break
+
         # Explore neighboring cells
-        for dx, dy in dirs:
-            new_x, new_y = x + dx, y + dy
-            if (0 <= new_x <= 99 and 0 <= new_y <= 99 and 
-                (new_x, new_y) not in locations_visited):
-                locations_visited.add((new_x, new_y))
-                queue.append((new_x, new_y, distance + 1))
-    
+        for k in range(4):
+            new_x, new_y = x + BFS_DIRECTIONS[k, 0], y + BFS_DIRECTIONS[k, 1]
+            if not ((new_x | new_y) & OUT_OF_GRID_MASK) and not visited[new_x, new_y]:
+                visited[new_x, new_y] = True
+                queue_x[tail], queue_y[tail], queue_distance[tail] = new_x, new_y, distance + 1
+                tail += 1
+
+    # Everything ever enqueued was marked visited, so clearing the queue restores the template
+    for i in range(tail):
+        visited[queue_x[i], queue_y[i]] = False
+    return found_x, found_y, found_distance
+
+def find_nearest_available_cell(pickup_location, drivers_rejected):
+    """Grid-cell nearest-driver lookup for large driver populations"""
+    # Count rejected drivers per cell so cells holding only rejected drivers are skipped
+    rejected_cells = []
+    for driver_id in rejected_driver_ids(drivers_rejected):
+        row = driver_row.get(driver_id)
+        if row is not None and driver_available[row]:
+            x, y = driver_coords[row]
+            cell_rejected[x, y] += 1
+            rejected_cells.append((x, y))
+
+    x, y, distance = bfs_nearest(
+        cell_available, pickup_location.x, pickup_location.y, cell_rejected,
+        bfs_visited, bfs_queue_x, bfs_queue_y, bfs_queue_distance,
+    )
+    for cell in rejected_cells:
+        cell_rejected[cell] = 0
+    if distance < 0:
+        return None, None
+
+    for driver_id in available_driver_locations[x * PADDED_GRID_SIZE + y]:
+        if not (drivers_rejected >> driver_idx[driver_id]) & 1:
+            return driver_id, distance
+
     return None, None
 
+def find_next_available_driver(pickup_location, drivers_rejected):
+    """Find the next closest available driver whose bit is not set in drivers_rejected"""
+    if available_driver_count == 0:
+        return None, None
+    # The BFS only stops early when available drivers are dense enough to be found nearby
+    if available_driver_count > GRID_SEARCH_MIN_DRIVERS:
+        return find_nearest_available_cell(pickup_location, drivers_rejected)
+
+    count = len(driver_row)
+
+    # One vectorized Manhattan-distance pass over every driver
+    coords = driver_coords[:count]
+    distances = np.abs(coords[:, 0] - pickup_location.x) + np.abs(coords[:, 1] - pickup_location.y)
+    distances[~driver_available[:count]] = UNREACHABLE_DISTANCE
+    for driver_id in rejected_driver_ids(drivers_rejected):
+        row = driver_row.get(driver_id)
+        if row is not None:
+            distances[row] = UNREACHABLE_DISTANCE
+
+    nearest = distances.argmin()
+    if distances[nearest] == UNREACHABLE_DISTANCE:
+        return None, None
+    return driver_ids[nearest], int(distances[nearest])
+
 def handle_driver_response(request: AddRideRequest):
     """Handle driver acceptance/rejection of a ride request"""
-    try:
-        if request.rider_id not in ride_requests:
-            return {"status": "error", "message": f"Ride request for rider {request.rider_id} not found"}
+    if request.rider_id not in ride_requests:
+        return {"status": "error", "message": f"Ride request for rider {request.rider_id} not found"}
+    
+    if request.driver_id not in drivers:
+        return {"status": "error", "message": f"Driver {request.driver_id} not found"}
+    
+    ride_request = ride_requests[request.rider_id]
+    
+    if request.did_driver_accept:
+        # Each driver serves one ride at a time, so a driver already on a trip cannot accept
+        if drivers[request.driver_id].status != "available":
+            return {"status": "error", "message": f"Driver {request.driver_id} is not available"}
         
-        if request.driver_id not in drivers:
-            return {"status": "error", "message": f"Driver {request.driver_id} not found"}
+        # Driver accepted the ride
+        drivers[request.driver_id].status = "on_trip"
+        sync_driver_row(request.driver_id)
+        cache_driver_json(request.driver_id)
+        ride_request.status = "assigned"
+        ride_request.assigned_driver = request.driver_id
+        assigned_rides[request.rider_id] = ride_request
+        cache_ride_json(request.rider_id)
+        return {
+            "status": "success",
+            "message": f"Driver {request.driver_id} accepted the ride for rider {request.rider_id}"
+        }
+    else:
+        # Driver rejected the ride - try to find another driver
+        ride_request.drivers_rejected |= 1 << driver_idx[request.driver_id]
+        cache_ride_json(request.rider_id)
         
-        ride_request = ride_requests[request.rider_id]
+        # Find next available driver
+        next_driver, distance = find_next_available_driver(
+            ride_request.pickup_location, 
+            ride_request.drivers_rejected
+        )
         
-        if request.did_driver_accept:
-            # Driver accepted the ride
-            drivers[request.driver_id].status = "on_trip"
-            ride_request.status = "assigned"
-            ride_request.assigned_driver = request.driver_id
+        if next_driver:
+            # Found another driver to try
             return {
                 "status": "success",
-                "message": f"Driver {request.driver_id} accepted the ride for rider {request.rider_id}"
+                "message": f"Driver {request.driver_id} rejected. Trying driver {next_driver}.",
+                "driver_selected": next_driver
             }
         else:
-            # Driver rejected the ride - try to find another driver
-            ride_request.drivers_rejected.add(request.driver_id)
-            
-            # Find next available driver
-            next_driver, distance = find_next_available_driver(
-                ride_request.pickup_location, 
-                ride_request.drivers_rejected
-            )
-            
-            if next_driver:
-                # Found another driver to try
-                return {
-                    "status": "success",
-                    "message": f"Driver {request.driver_id} rejected. Trying driver {next_driver}.",
-                    "driver_selected": next_driver
-                }
-            else:
-                # No more available drivers - remove the ride request
-                del ride_requests[request.rider_id]
-                return {
-                    "status": "error",
-                    "message": f"All available drivers rejected the ride for rider {request.rider_id}. Ride request cancelled."
-                }
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
-
-@app.get("/")
-def read_root():
+            # No more available drivers - remove the ride request
+            del ride_requests[request.rider_id]
+            assigned_rides.pop(request.rider_id, None)
+            del ride_json[request.rider_id]
+            return {
+                "status": "error",
+                "message": f"All available drivers rejected the ride for rider {request.rider_id}. Ride request cancelled."
+            }
+
+@app.get("/", response_model=None)
+async def read_root():
     return {"message": "Ride Dispatch System API"}
 
-@app.post("/add_driver")
-def add_driver(request: AddDriverRequest):
+@app.post("/add_driver", response_model=None)
+async def add_driver(request: AddDriverRequest):
     """Add a new driver to the system"""
-    try:
+    async with state_lock:
         # Validate coordinates
         if not (0 <= request.x <= 99 and 0 <= request.y <= 99):
             raise HTTPException(status_code=400, detail="Coordinates must be between 0 and 99")
 
         if request.id in drivers:
-            drivers[request.id].location.x = request.x
-            drivers[request.id].location.y = request.y
+            # Re-adding an existing driver moves it
+            relocate_driver(request.id, request.x, request.y)
         else:
             drivers[request.id] = Driver(id=request.id, location=Location(x=request.x, y=request.y))
+            if request.id not in driver_idx:
+                driver_idx[request.id] = len(driver_id_by_idx)
+                driver_id_by_idx.append(request.id)
         
-        loc_tuple = (request.x, request.y)
-        if loc_tuple not in driver_locations:
-            driver_locations[loc_tuple] = []
-        driver_locations[loc_tuple].append(request.id)
+            cell = request.x * PADDED_GRID_SIZE + request.y
+            if cell not in driver_locations:
+                driver_locations[cell] = set()
+            driver_locations[cell].add(request.id)
+            sync_driver_row(request.id)
+            cache_driver_json(request.id)
         
         # For now, just return success
         return {"status": "success", "message": f"Driver {request.id} added at ({request.x}, {request.y})"}
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
 
-@app.post("/add_rider")
-def add_rider(request: AddRiderRequest):
+@app.post("/add_rider", response_model=None)
+async def add_rider(request: AddRiderRequest):
     """Add a new rider to the system"""
-    try:
+    async with state_lock:
         # Validate coordinates
         if not (0 <= request.x <= 99 and 0 <= request.y <= 99):
             raise HTTPException(status_code=400, detail="Coordinates must be between 0 and 99")
@@ -189,46 +395,44 @@ def add_rider(request: AddRiderRequest):
             pickup_location=location,
             dropoff_location=location
         )
+        cache_rider_json(request.id)
         
         return {"status": "success", "message": f"Rider {request.id} added at ({request.x}, {request.y})"}
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
 
-@app.post("/delete_driver")
-def delete_driver(request: DeleteDriverRequest):
+@app.post("/delete_driver", response_model=None)
+async def delete_driver(request: DeleteDriverRequest):
     """Remove a driver from the system"""
-    try:
+    async with state_lock:
         if request.id in drivers:
             # Remove from driver_locations mapping
-            driver_location = (drivers[request.id].location.x, drivers[request.id].location.y)
+            driver_location = drivers[request.id].location.x * PADDED_GRID_SIZE + drivers[request.id].location.y
             if driver_location in driver_locations:
                 driver_locations[driver_location].remove(request.id)
                 if not driver_locations[driver_location]:  # If no more drivers at this location
                     del driver_locations[driver_location]
-            
+        
+            remove_driver_row(request.id)
             del drivers[request.id]
+            del driver_json[request.id]
             return {"status": "success", "message": f"Driver {request.id} removed"}
         else:
             return {"status": "error", "message": f"Driver {request.id} not found"}
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
 
-@app.post("/delete_rider")
-def delete_rider(request: DeleteRiderRequest):
+@app.post("/delete_rider", response_model=None)
+async def delete_rider(request: DeleteRiderRequest):
     """Remove a rider from the system"""
-    try:
+    async with state_lock:
         if request.id in riders:
             del riders[request.id]
+            del rider_json[request.id]
             return {"status": "success", "message": f"Rider {request.id} removed"}
         else:
             return {"status": "error", "message": f"Rider {request.id} not found"}
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
 
-@app.post("/add_ride")
-def add_ride(request: AddRideRequest):
+@app.post("/add_ride", response_model=None)
+async def add_ride(request: AddRideRequest):
     """Request a new ride"""
-    try:
+    async with state_lock:
         # If this is a driver response (acceptance/rejection)
         if request.did_driver_accept is not None and request.driver_id is not None:
             return handle_driver_response(request)
@@ -245,32 +449,7 @@ def add_ride(request: AddRideRequest):
         pickup_location = riders[request.rider_id].pickup_location
         dropoff_location = Location(x=request.dropoff_x, y=request.dropoff_y)
 
-        # BFS to find closest available driver
-        queue = deque()
-        queue.append((pickup_location.x, pickup_location.y, 0))
-        dirs = [(1,0), (-1,0), (0,1), (0,-1)]
-        locations_visited = set()
-        locations_visited.add((pickup_location.x, pickup_location.y))
-        closest_driver = None
-        
-        while queue:
-            x, y, distance = queue.popleft()
-            
-            if (x, y) in driver_locations:
-                for driver_id in driver_locations[(x, y)]:
-                    if drivers[driver_id].status == "available":
-                        closest_driver = driver_id
-                        break
-                if closest_driver:
-                    break
-            
-            # If we haven't found a driver yet, explore neighboring cells
-            for dx, dy in dirs:
-                new_x, new_y = x + dx, y + dy
-                # Check bounds
-                if 0 <= new_x <= 99 and 0 <= new_y <= 99 and (new_x, new_y) not in locations_visited:
-                    locations_visited.add((new_x, new_y))
-                    queue.append((new_x, new_y, distance + 1))
+        closest_driver, _ = find_next_available_driver(pickup_location, 0)
         
         if not closest_driver:
             return {
@@ -278,132 +457,136 @@ def add_ride(request: AddRideRequest):
                 "message": f"No available drivers found for rider {request.rider_id}"
             }
 
-        # Create ride request
+        # Create ride request, replacing any earlier one for this rider
+        assigned_rides.pop(request.rider_id, None)
         ride_requests[request.rider_id] = RideRequest(
             rider_id=request.rider_id,
             pickup_location=pickup_location,
             dropoff_location=dropoff_location,
-            drivers_rejected=set(),
         )
+        cache_ride_json(request.rider_id)
         
         return {
             "status": "success", 
             "message": f"Driver {closest_driver} found. Checking if they want to accept.",
             "driver_selected": closest_driver
         }
-       
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
 
-def move_driver_towards_target(driver_id, target_x, target_y):
-    """Move driver one step towards the target location"""
+def relocate_driver(driver_id, new_x, new_y):
+    """Move a driver to a new cell, keeping every location index in step"""
     driver = drivers[driver_id]
-    current_x, current_y = driver.location.x, driver.location.y
-    
-    # Calculate direction to move
-    dx = 0
-    dy = 0
-    
-    if current_x < target_x:
-        dx = 1
-    elif current_x > target_x:
-        dx = -1
-    
-    if current_y < target_y:
-        dy = 1
-    elif current_y > target_y:
-        dy = -1
-    
-    # Update driver location
-    new_x = max(0, min(99, current_x + dx))
-    new_y = max(0, min(99, current_y + dy))
+    old_location = driver.location.x * PADDED_GRID_SIZE + driver.location.y
+    new_location = new_x * PADDED_GRID_SIZE + new_y
+    if new_location == old_location:
+        return
     
     # Update driver_locations mapping
-    old_location = (current_x, current_y)
-    new_location = (new_x, new_y)
-    
-    if old_location in driver_locations:
-        driver_locations[old_location].remove(driver_id)
-        if not driver_locations[old_location]:
-            del driver_locations[old_location]
+    cell_drivers = driver_locations[old_location]
+    cell_drivers.remove(driver_id)
+    if not cell_drivers:
+        del driver_locations[old_location]
     
     if new_location not in driver_locations:
-        driver_locations[new_location] = []
-    driver_locations[new_location].append(driver_id)
+        driver_locations[new_location] = set()
+    driver_locations[new_location].add(driver_id)
     
     # Update driver location
     driver.location.x = new_x
     driver.location.y = new_y
+    sync_driver_row(driver_id)
+    cache_driver_json(driver_id)
+
+def move_drivers_towards_targets(driver_ids_batch, targets):
+    """Move each driver one step towards its (x, y) target and return the new positions"""
+    rows = np.fromiter((driver_row[driver_id] for driver_id in driver_ids_batch),
+                       dtype=np.intp, count=len(driver_ids_batch))
+    positions = driver_coords[rows]
+    
+    # Targets are validated to lie on the grid, so a single step towards one cannot leave it
+    new_positions = positions + np.sign(targets - positions)
     
-    return new_x, new_y
+    # Only drivers that actually changed cell need their indexes touched
+    moved = np.flatnonzero((new_positions != positions).any(axis=1))
+    for i, (new_x, new_y) in zip(moved.tolist(), new_positions[moved].tolist()):
+        relocate_driver(driver_ids_batch[i], new_x, new_y)
+    
+    return new_positions
 
-@app.post("/tick")
-def tick():
+@app.post("/tick", response_model=None)
+async def tick():
     """Advance simulation time by one tick"""
-    try:
+    async with state_lock:
         global current_tick
         current_tick += 1
         
-        # Process all assigned rides
+        # Only accepted rides move; snapshot them so completed ones can be removed afterwards
+        active_rides = list(assigned_rides.items())
         completed_rides = []
-        for rider_id, ride_request in ride_requests.items():
-            if ride_request.status == "assigned" and ride_request.assigned_driver:
+        if active_rides:
+            targets = np.array([
+                (ride_request.pickup_location.x, ride_request.pickup_location.y)
+                if ride_request.current_phase == "to_pickup"
+                else (ride_request.dropoff_location.x, ride_request.dropoff_location.y)
+                for _, ride_request in active_rides
+            ], dtype=np.int16)
+            new_positions = move_drivers_towards_targets(
+                [ride_request.assigned_driver for _, ride_request in active_rides], targets
+            )
+            arrived = (new_positions == targets).all(axis=1)
+        
+            for (rider_id, ride_request), has_arrived in zip(active_rides, arrived.tolist()):
+                if not has_arrived:
+                    continue
                 driver_id = ride_request.assigned_driver
-                
+            
                 if ride_request.current_phase == "to_pickup":
-                    # Move towards pickup location
-                    pickup_x = ride_request.pickup_location.x
-                    pickup_y = ride_request.pickup_location.y
-                    
-                    new_x, new_y = move_driver_towards_target(driver_id, pickup_x, pickup_y)
-                    
-                    # Check if we've reached pickup location
-                    if new_x == pickup_x and new_y == pickup_y:
-                        ride_request.current_phase = "to_dropoff"
-                
+                    # Reached pickup location
+                    ride_request.current_phase = "to_dropoff"
+                    cache_ride_json(rider_id)
+            
                 elif ride_request.current_phase == "to_dropoff":
-                    # Move towards dropoff location
+                    # Reached dropoff location
                     dropoff_x = ride_request.dropoff_location.x
                     dropoff_y = ride_request.dropoff_location.y
-                    
-                    new_x, new_y = move_driver_towards_target(driver_id, dropoff_x, dropoff_y)
-                    
-                    # Check if we've reached dropoff location
-                    if new_x == dropoff_x and new_y == dropoff_y:
-                        ride_request.current_phase = "completed"
-                        ride_request.status = "completed"
-                        drivers[driver_id].status = "available"
-                        
-                        # Update rider location to dropoff location
-                        if ride_request.rider_id in riders:
-                            riders[ride_request.rider_id].pickup_location.x = dropoff_x
-                            riders[ride_request.rider_id].pickup_location.y = dropoff_y
-                            riders[ride_request.rider_id].dropoff_location.x = dropoff_x
-                            riders[ride_request.rider_id].dropoff_location.y = dropoff_y
-                        
-                        completed_rides.append(rider_id)
+                    ride_request.current_phase = "completed"
+                    ride_request.status = "completed"
+                    drivers[driver_id].status = "available"
+                    sync_driver_row(driver_id)
+                    cache_driver_json(driver_id)
+                
+                    # Update rider location to dropoff location
+                    if ride_request.rider_id in riders:
+                        riders[ride_request.rider_id].pickup_location.x = dropoff_x
+                        riders[ride_request.rider_id].pickup_location.y = dropoff_y
+                        riders[ride_request.rider_id].dropoff_location.x = dropoff_x
+                        riders[ride_request.rider_id].dropoff_location.y = dropoff_y
+                        cache_rider_json(ride_request.rider_id)
+                
+                    completed_rides.append(rider_id)
         
         # Remove completed rides
         for rider_id in completed_rides:
             del ride_requests[rider_id]
+            del assigned_rides[rider_id]
+            del ride_json[rider_id]
         
         return {
             "status": "success", 
             "message": f"Advanced to tick {current_tick}. Processed {len(ride_requests)} active rides."
         }
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
 
-@app.get("/state")
-def get_state():
+@app.get("/state", response_model=None)
+async def get_state():
     """Get current system state"""
-    return {
-        "drivers": list(drivers.values()),
-        "riders": list(riders.values()),
-        "ride_requests": list(ride_requests.values()),
+    # Snapshots are already plain dicts, so skip FastAPI's encoder and hand them to orjson
+    return ORJSONResponse({
+        "drivers": list(driver_json.values()),
+        "riders": list(rider_json.values()),
+        "ride_requests": list(ride_json.values()),
         "current_tick": current_tick
-    }
+    })
 
 if __name__ == "__main__":
     import uvicorn
-    uvicorn.run(app, host="0.0.0.0", port=8000)
+    # Dispatch state lives in this process, so scale with a faster loop rather than more workers
+    uvicorn.run(app, host="0.0.0.0", port=8000, loop="uvloop", http="httptools")
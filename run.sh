@@ -6,7 +6,7 @@ echo "🚀 Starting Ride Dispatch System..."
 echo "📦 Starting FastAPI backend..."
 cd backend
 source venv/bin/activate
-uvicorn main:app --reload --host 0.0.0.0 --port 8000 &
+uvicorn main:app --reload --host 0.0.0.0 --port 8000 --loop uvloop --http httptools &
 BACKEND_PID=$!
 cd ..
 
@@ -19,7 +19,7 @@ cd ..
 echo "✅ Setup complete!"
 echo ""
 echo "To run the system:"
-echo "1. Start the backend: cd backend && source venv/bin/activate && uvicorn main:app --reload"
+echo "1. Start the backend: cd backend && source venv/bin/activate && uvicorn main:app --reload --loop uvloop --http httptools"
 echo "2. Start the frontend: cd frontend && npm start"
 echo ""
 echo "The frontend will be available at http://localhost:3000"